@@ -2,7 +2,7 @@
 set -e
 
 if [[ -f "${HF_TOKEN_FILE}" ]]; then
-  export HF_TOKEN=$(cat "${HF_TOKEN_FILE}")
+  export HF_TOKEN=$(<"${HF_TOKEN_FILE}")
 fi
 
 exec /entrypoint.sh "$@"
@@ -5,11 +5,16 @@ import os
 import psycopg2
 import requests
 from pgvector.psycopg2 import register_vector
+from psycopg2.extras import execute_values
 
 # --- Configuration ---
 TEI_EMBED_URL = "http://localhost:4001"
 TEI_RERANK_URL = "http://localhost:4002"
 VECTOR_SIZE = 768
+# TEI rejects requests with more inputs than MAX_CLIENT_BATCH_SIZE (default 32)
+EMBED_BATCH_SIZE = 32
+# Markdown chunks starting with these (rules, headers) are not embedded
+SKIP_CHUNK_PREFIXES = ("---", "# ", "## ", "### ", "#### ")
 
 # --- DB Configuration ---
 PG_HOST = os.environ.get("POSTGRES_HOST", "localhost")
@@ -19,6 +24,10 @@ PG_PASSWORD = os.environ.get("POSTGRES_PASSWORD", "postgres")
 PG_DB = os.environ.get("POSTGRES_DB", "vectorchord")
 TABLE_NAME = "knowledge_embeddings"
 
+# Shared keep-alive session for /embed and /rerank calls
+session = requests.Session()
+session.headers.update({"Content-Type": "application/json"})
+
 
 def get_db_connection():
     return psycopg2.connect(
@@ -30,16 +39,23 @@ def get_db_connection():
     )
 
 
+def get_embeddings(texts):
+    """Fetch embeddings for a list of texts from TEI /embed, one request per batch."""
+    embeddings = []
+    for start in range(0, len(texts), EMBED_BATCH_SIZE):
+        response = session.post(
+            f"{TEI_EMBED_URL}/embed",
+            json={"inputs": texts[start : start + EMBED_BATCH_SIZE]},
+        )
+        response.raise_for_status()
+        # TEI returns a list of lists of floats: [[0.1, 0.2, ...], ...]
+        embeddings.extend(response.json())
+    return embeddings
+
+
 def get_embedding(text):
-    """Fetch embedding from TEI /embed endpoint."""
-    response = requests.post(
-        f"{TEI_EMBED_URL}/embed",
-        json={"inputs": text},
-        headers={"Content-Type": "application/json"},
-    )
-    response.raise_for_status()
-    # TEI returns a list of lists of floats: [[0.1, 0.2, ...]]
-    return response.json()[0]
+    """Fetch embedding for a single text from TEI /embed endpoint."""
+    return get_embeddings([text])[0]
 
 
 def rerank(query, documents):
@@ -50,11 +66,7 @@ def rerank(query, documents):
         "top_n": 5,
     }
 
-    response = requests.post(
-        f"{TEI_RERANK_URL}/rerank",
-        json=payload,
-        headers={"Content-Type": "application/json"},
-    )
+    response = session.post(f"{TEI_RERANK_URL}/rerank", json=payload)
 
     if response.status_code != 200:
         print(f"DEBUG: TEI rejected payload. Response: {response.text}")
@@ -101,18 +113,12 @@ def embed_file(file_path):
         chunks = []
         for chunk in raw_chunks:
             # Skip horizontal lines, title headers, and metadata sections
-            if (
-                chunk.startswith("---")
-                or chunk.startswith("# ")
-                or chunk.startswith("## ")
-                or chunk.startswith("### ")
-                or chunk.startswith("#### ")
-            ):
+            if chunk.startswith(SKIP_CHUNK_PREFIXES):
                 continue
             chunks.append(chunk)
     else:
         # Standard line-by-line fallback
-        chunks = [p.strip() for p in content.split("\n") if p.strip()]
+        chunks = [p.strip() for p in content.splitlines() if p.strip()]
 
     print(f"🚀 Embedding {len(chunks)} chunks from {file_path}...")
 
@@ -120,13 +126,14 @@ def embed_file(file_path):
     conn.autocommit = True
     register_vector(conn)
 
+    vectors = get_embeddings(chunks)
+
     with conn.cursor() as cur:
-        for chunk in chunks:
-            vector = get_embedding(chunk)
-            cur.execute(
-                f"INSERT INTO {TABLE_NAME} (text, embedding) VALUES (%s, %s);",
-                (chunk, vector),
-            )
+        execute_values(
+            cur,
+            f"INSERT INTO {TABLE_NAME} (text, embedding) VALUES %s;",
+            list(zip(chunks, vectors)),
+        )
 
     conn.close()
     print(f"✅ Success! Data indexed in table: {TABLE_NAME}")
@@ -22,6 +22,8 @@ whatever the image currently ships:
     patches/README.md for how to update the patch in that case.
 """
 
+import os
+import shutil
 import sys
 from pathlib import Path
 
@@ -47,6 +49,19 @@ PATCHES = [
 ]
 
 
+def write_atomic(path: Path, text: str) -> None:
+    # Write a sibling temp file and rename it over the original, so a
+    # container killed mid-write can't leave a truncated source file that
+    # the next start would reject as "expected code not found".
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    shutil.copymode(path, tmp)
+    os.replace(tmp, path)
+
+
 def main() -> int:
     for path, old, new in PATCHES:
         text = path.read_text()
@@ -65,7 +80,7 @@ def main() -> int:
             )
             return 1
 
-        path.write_text(text.replace(old, new, 1))
+        write_atomic(path, text.replace(old, new, 1))
         print(f"[vchordrq-patch] {path}: patched")
 
     return 0
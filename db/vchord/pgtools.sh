@@ -18,10 +18,9 @@ POSTGRES_USER="${POSTGRES_USER:-postgres}"
 # Path to the secret file on the HOST (derived from .env DATA_DIR)
 # By default secret is mapped from ${DATA_DIR}/db_password.txt
 HOST_SECRET_FILE=${HOST_SECRET_FILE:-"${DATA_DIR}/db_password.txt"}
-ROOT_PASS=$(<"$HOST_SECRET_FILE")
 
 # Pre-flight Checks
-if ! docker ps --format '{{.Names}}' | grep -q "^${CONTAINER_NAME}$"; then
+if [[ "$(docker inspect -f '{{.State.Running}}' "$CONTAINER_NAME" 2>/dev/null)" != "true" ]]; then
     echo "Error: Container '${CONTAINER_NAME}' is not running."
     exit 1
 fi
@@ -30,6 +29,7 @@ if [[ ! -f "$HOST_SECRET_FILE" ]]; then
     echo "Error: Root password file not found at: $HOST_SECRET_FILE"
     exit 1
 fi
+ROOT_PASS=$(<"$HOST_SECRET_FILE")
 
 # --- Core Functions ---
 
@@ -79,24 +79,22 @@ cmd_bootstrap() {
         echo "Database '$DB_NAME' already exists. Skipping creation."
         echo
     else
-        # Check if User/Role exists
-        local ROLE_EXISTS
-        ROLE_EXISTS=$(docker exec -i "$CONTAINER_NAME" psql -U "$POSTGRES_USER" -tAc "SELECT 1 FROM pg_roles WHERE rolname='$DB_NAME'")
-
-        if [[ "$ROLE_EXISTS" == "1" ]]; then
-             echo "User '$DB_NAME' already exists. Skipping user creation."
-        else
-             echo "Creating User '$DB_NAME'..."
-             docker exec -i "$CONTAINER_NAME" psql -U "$POSTGRES_USER" -c "CREATE ROLE \"$DB_NAME\" WITH LOGIN PASSWORD '$DB_PASS';"
-        fi
-
-        # Create Database
-        echo "Creating Database '$DB_NAME'..."
-        docker exec -i "$CONTAINER_NAME" psql -U "$POSTGRES_USER" -c "CREATE DATABASE \"$DB_NAME\" OWNER \"$DB_NAME\";"
-
-        # Grant Permissions
-        echo "Granting permissions..."
-        docker exec -i "$CONTAINER_NAME" psql -U "$POSTGRES_USER" -c "GRANT ALL PRIVILEGES ON DATABASE \"$DB_NAME\" TO \"$DB_NAME\";"
+        # Create the role (unless it already exists), database and grants in
+        # a single psql session; \gexec runs each generated statement on its
+        # own, so CREATE DATABASE stays outside a transaction block
+        echo "Creating User and Database '$DB_NAME'..."
+        docker exec -i "$CONTAINER_NAME" psql -U "$POSTGRES_USER" -v ON_ERROR_STOP=1 \
+            -v name="$DB_NAME" -v pw="$DB_PASS" <<'SQL'
+SELECT format('CREATE ROLE %I WITH LOGIN PASSWORD %L', :'name', :'pw')
+WHERE NOT EXISTS (SELECT FROM pg_roles WHERE rolname = :'name')
+\gexec
+
+SELECT format('CREATE DATABASE %I OWNER %I', :'name', :'name')
+\gexec
+
+SELECT format('GRANT ALL PRIVILEGES ON DATABASE %I TO %I', :'name', :'name')
+\gexec
+SQL
 
         echo "User '$DB_NAME' and Database '$DB_NAME' created."
         echo
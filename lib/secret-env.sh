@@ -8,7 +8,7 @@
 set -eu
 for f in /run/secrets/*; do
   [ -f "$f" ] || continue
-  name=$(basename "$f")
+  name=${f##*/}
   case "$name" in
     *[A-Z]*) var=$name ;;
     *)       var=$(printf %s "$name" | tr '[:lower:]' '[:upper:]') ;;